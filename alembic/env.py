@@ -4,7 +4,7 @@ from alembic import context
 from sqlalchemy import create_engine, pool
 
 from app.core.config import settings
-from app.db.base import Base
+from app.db.base import Base, DirectoryBase
 from app.db import models  # noqa: F401
 
 config = context.config
@@ -12,33 +12,50 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-target_metadata = Base.metadata
+# URL 별 역할: 디렉터리(DATABASE_URL) / 샤드(SHARD_DATABASE_URLS)
+# 단일 DB 구성에서는 한 URL 이 두 역할을 모두 가진다.
+# 마이그레이션 스크립트는 config.attributes["db_roles"] 를 보고 자기 역할의 테이블만 다룬다.
+database_roles: dict = {settings.database_url: {"directory"}}
+for url in settings.shard_urls.values():
+    database_roles.setdefault(url, set()).add("shard")
+
+
+def _target_metadata(roles: set) -> list:
+    metadata = []
+    if "directory" in roles:
+        metadata.append(DirectoryBase.metadata)
+    if "shard" in roles:
+        metadata.append(Base.metadata)
+    return metadata
 
 
 def run_migrations_offline() -> None:
-    url = settings.database_url
-    context.configure(
-        url=url,
-        target_metadata=target_metadata,
-        literal_binds=True,
-        dialect_opts={"paramstyle": "named"},
-    )
+    for url, roles in database_roles.items():
+        config.attributes["db_roles"] = roles
+        context.configure(
+            url=url,
+            target_metadata=_target_metadata(roles),
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+        )
 
-    with context.begin_transaction():
-        context.run_migrations()
+        with context.begin_transaction():
+            context.run_migrations()
 
 
 def run_migrations_online() -> None:
-    connectable = create_engine(settings.database_url, poolclass=pool.NullPool)
+    for url, roles in database_roles.items():
+        config.attributes["db_roles"] = roles
+        connectable = create_engine(url, poolclass=pool.NullPool)
 
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        with connectable.connect() as connection:
+            context.configure(connection=connection, target_metadata=_target_metadata(roles))
 
-        with context.begin_transaction():
-            context.run_migrations()
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
     run_migrations_offline()
 else:
-    run_migrations_online()
\ No newline at end of file
+    run_migrations_online()
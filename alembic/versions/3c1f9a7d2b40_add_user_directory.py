@@ -0,0 +1,49 @@
+"""add user_directory
+
+Revision ID: 3c1f9a7d2b40
+Revises: 9520ed2e3e96
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '9520ed2e3e96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # user_directory 는 디렉터리 DB 에만
+    if "directory" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
+    op.create_table('user_directory',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('email', sa.String(length=320), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_directory_email'), 'user_directory', ['email'], unique=True)
+    # 기존 단일 DB 사용자를 디렉터리로 이관(id 유지). users/refresh_tokens row 의 샤드 이동은
+    # scripts/rebalance_shards.py 로 별도 수행.
+    # offline(SQL 출력) 모드는 테이블 존재를 확인할 수 없으므로 users 가 확실히 있는 DB(샤드 역할 겸용)에만 출력
+    if context.is_offline_mode():
+        backfill = "shard" in context.config.attributes.get("db_roles", {"directory", "shard"})
+    else:
+        backfill = sa.inspect(op.get_bind()).has_table('users')
+    if backfill:
+        op.execute('INSERT INTO user_directory (id, email) SELECT id, email FROM users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if "directory" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
+    op.drop_index(op.f('ix_user_directory_email'), table_name='user_directory')
+    op.drop_table('user_directory')
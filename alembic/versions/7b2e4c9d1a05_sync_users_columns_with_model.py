@@ -0,0 +1,40 @@
+"""sync users columns with model
+
+Revision ID: 7b2e4c9d1a05
+Revises: 3c1f9a7d2b40
+Create Date: 2026-10-19 14:03:52.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4c9d1a05'
+down_revision: Union[str, Sequence[str], None] = '3c1f9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 초기 마이그레이션은 create_at 오타 + password_hash 누락 상태라 alembic 으로 만든 새 샤드가 모델과 다르다.
+    # 이미 손으로 맞춰 둔 DB 도 있으므로 없는 것만 보정
+    if "shard" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
+    if context.is_offline_mode():
+        return
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('users')}
+    with op.batch_alter_table('users') as batch_op:
+        if 'create_at' in columns and 'created_at' not in columns:
+            batch_op.alter_column('create_at', new_column_name='created_at', existing_type=sa.DateTime(timezone=True), existing_nullable=False, existing_server_default=sa.func.now())
+        if 'password_hash' not in columns:
+            batch_op.add_column(sa.Column('password_hash', sa.String(length=255), server_default='', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 보정 전 상태는 DB 마다 달라 되돌리지 않는다
+    pass
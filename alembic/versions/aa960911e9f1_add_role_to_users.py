@@ -7,7 +7,7 @@ Create Date: 2025-12-22 16:19:00.804912
 """
 from typing import Sequence, Union
 
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 
 
@@ -20,6 +20,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    # users / refresh_tokens 는 샤드 DB 에만
+    if "shard" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('users', sa.Column('role', sa.String(length=32), server_default='user', nullable=False))
     op.create_index(op.f('ix_users_role'), 'users', ['role'], unique=False)
@@ -28,6 +31,8 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
+    if "shard" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
     # ### commands auto generated by Alembic - please adjust! ###
     op.drop_index(op.f('ix_users_role'), table_name='users')
     op.drop_column('users', 'role')
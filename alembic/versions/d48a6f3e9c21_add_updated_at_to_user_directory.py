@@ -0,0 +1,37 @@
+"""add updated_at to user_directory
+
+Revision ID: d48a6f3e9c21
+Revises: 7b2e4c9d1a05
+Create Date: 2026-10-19 15:41:07.593120
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd48a6f3e9c21'
+down_revision: Union[str, Sequence[str], None] = '7b2e4c9d1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # user_directory 는 디렉터리 DB 에만
+    if "directory" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
+    with op.batch_alter_table('user_directory') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+        batch_op.create_index(batch_op.f('ix_user_directory_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if "directory" not in context.config.attributes.get("db_roles", {"directory", "shard"}):
+        return
+    with op.batch_alter_table('user_directory') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_directory_updated_at'))
+        batch_op.drop_column('updated_at')
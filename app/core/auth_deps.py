@@ -1,40 +1,19 @@
-from typing import Optional
+from typing import Any, Dict
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db
-from app.core.security import decode_token
+from app.core.deps import get_access_claims, get_db
 from app.db.models import User
 
 # Access 가드 추가
 
-bearer = HTTPBearer(auto_error=False)
-
-def get_current_user(creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer), db: Session = Depends(get_db)) -> User:
-    if not creds:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing access token",)
-    
-    token = creds.credentials
-    try:
-        claims = decode_token(token)
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token",)
-    
-    if claims.get("typ") != "access":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type",)
-    
-    sub = claims.get("sub")
-    if not sub:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token",)
-    
-    user = db.get(User, int(sub))
+def get_current_user(claims: Dict[str, Any] = Depends(get_access_claims), db: Session = Depends(get_db)) -> User:
+    user = db.get(User, int(claims["sub"]))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found",)
     
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive",)
 
-    return user
\ No newline at end of file
+    return user
@@ -16,5 +16,36 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     
     database_url: str = Field(..., alias="DATABASE_URL")
+    # 콤마로 구분된 "이름=URL" 샤드 목록. 비어 있으면 DATABASE_URL 하나를 "default" 샤드로 사용
+    # 라우팅/refresh token 힌트는 목록 순서가 아니라 샤드 이름 기준 -> 이름은 한번 정하면 바꾸지 말 것
+    shard_database_urls: str = Field(default="", alias="SHARD_DATABASE_URLS")
+    shard_virtual_nodes: int = Field(default=64, alias="SHARD_VIRTUAL_NODES")
+
+    # 로그인 이메일 bloom filter (credential stuffing 방어)
+    login_filter_capacity: int = Field(default=100_000, alias="LOGIN_FILTER_CAPACITY")
+    login_filter_error_rate: float = Field(default=0.01, alias="LOGIN_FILTER_ERROR_RATE")
+    # 다른 워커에서 가입/이메일 변경된 계정이 이 워커에서 거절될 수 있는 최대 시간
+    login_filter_refresh_sec: float = Field(default=1.0, alias="LOGIN_FILTER_REFRESH_SEC")
+    login_filter_rebuild_sec: float = Field(default=300.0, alias="LOGIN_FILTER_REBUILD_SEC")
+    # 증분 갱신 시 updated_at 을 이만큼 겹쳐 읽는다 (늦게 commit 된 row 대비)
+    login_filter_overlap_sec: float = Field(default=30.0, alias="LOGIN_FILTER_OVERLAP_SEC")
+    # 로그인 실패 응답은 최소 이 시간을 채운 뒤 반환 (계정 존재 여부 타이밍 노출 방지)
+    login_failure_min_sec: float = Field(default=0.5, alias="LOGIN_FAILURE_MIN_SEC")
+
+    @property
+    def shard_urls(self) -> dict[str, str]:
+        shards: dict[str, str] = {}
+        for entry in self.shard_database_urls.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            name, sep, url = entry.partition("=")
+            name, url = name.strip(), url.strip()
+            if not sep or not name or not url or ":" in name or "/" in name:
+                raise ValueError(f"SHARD_DATABASE_URLS entry must be name=url: {entry}")
+            if name in shards:
+                raise ValueError(f"Duplicate shard name: {name}")
+            shards[name] = url
+        return shards or {"default": self.database_url}
 
 settings = Settings()
\ No newline at end of file
@@ -1,9 +1,52 @@
-from typing import Generator
-from app.db.session import SessionLocal
+from typing import Any, Dict, Generator, Optional
 
-def get_db() -> Generator:
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+
+from app.core.security import decode_token, user_id_from_sub
+from app.db.session import SessionLocal, router
+
+bearer = HTTPBearer(auto_error=False)
+
+# Access token 검증 후 claims 반환 (요청 단위로 캐시되어 get_db / get_current_user 가 공유)
+def get_access_claims(creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer)) -> Dict[str, Any]:
+    if not creds:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing access token",)
+
+    try:
+        claims = decode_token(creds.credentials)
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token",)
+
+    if claims.get("typ") != "access":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type",)
+
+    if user_id_from_sub(claims.get("sub")) is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token",)
+
+    return claims
+
+# 토큰 sub(user_id) 가 속한 샤드의 세션
+def get_db(claims: Dict[str, Any] = Depends(get_access_claims)) -> Generator:
+    db = router.session_for(claims["sub"])
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 경로의 user_id 가 속한 샤드의 세션 (관리자가 다른 유저를 다루는 경우)
+def get_user_db(user_id: int) -> Generator:
+    db = router.session_for(user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 전역 디렉터리(email -> user_id) 세션
+def get_directory_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
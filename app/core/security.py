@@ -16,6 +16,16 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
+# 존재하지 않는 계정도 실제 계정과 같은 bcrypt 비용을 쓰도록 미리 계산해 둔 더미 해시
+_DUMMY_PASSWORD_HASH = pwd_context.hash(secrets.token_urlsafe(32))
+
+def verify_password_dummy(password: str) -> bool:
+    """
+    로그인 실패 경로 타이밍 평준화용. 항상 False
+    """
+    pwd_context.verify(password, _DUMMY_PASSWORD_HASH)
+    return False
+
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -36,7 +46,7 @@ def create_access_token(subject: str, extra_claims: Optional[Dict[str, Any]] = N
     
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
-def create_refresh_token(subject: str) -> str:
+def create_refresh_token(subject: str, shard_id: Optional[str] = None) -> str:
     now = _now_utc()
     exp = now + timedelta(days=settings.refresh_token_expires_days)
     payload: Dict[str, Any] = {
@@ -48,6 +58,9 @@ def create_refresh_token(subject: str) -> str:
         "jti": secrets.token_urlsafe(24),
         "typ": "refresh",
     }
+    # 샤드 힌트(샤드 이름): token_hash 조회 시 전 샤드 scatter-gather 없이 바로 라우팅
+    if shard_id is not None:
+        payload["shd"] = shard_id
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 def decode_token(token: str) -> Dict[str, Any]:
@@ -62,6 +75,22 @@ def decode_token(token: str) -> Dict[str, Any]:
         issuer=settings.jwt_issuer
     )
 
+def user_id_from_sub(sub: Any) -> Optional[int]:
+    """
+    sub claim -> user_id. ASCII 숫자 문자열이 아니면 None
+    ("²" 같은 유니코드 숫자는 isdigit() 은 통과하지만 int() 에서 ValueError)
+    """
+    if isinstance(sub, str) and sub.isascii() and sub.isdigit():
+        return int(sub)
+    return None
+
+def get_unverified_claims(token: str) -> Dict[str, Any]:
+    """
+    서명/만료 검증 없이 claims 만 읽는다. 라우팅 용도로만 사용할 것.
+    Raises JWTError on malformed token
+    """
+    return jwt.get_unverified_claims(token)
+
 def refresh_cookie_params() -> Dict[str, Any]:
     # 개발환경에서만 secure=False 허용/ 운영에 붙일 경우 True.
     secure = settings.env != "dev"
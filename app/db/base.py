@@ -1,4 +1,9 @@
 from sqlalchemy.orm import DeclarativeBase
 
+# 샤드 DB 스키마 (users / refresh_tokens)
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
+
+# 전역 디렉터리 DB 스키마 (user_directory)
+class DirectoryBase(DeclarativeBase):
+    pass
@@ -5,7 +5,7 @@ from sqlalchemy import String, DateTime, Boolean, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
-from app.db.base import Base
+from app.db.base import Base, DirectoryBase
 
 class User(Base):
     __tablename__ = "users"
@@ -35,4 +35,15 @@ class RefreshToken(Base):
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
\ No newline at end of file
+    user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
+
+# 전역 디렉터리(DATABASE_URL): email -> user_id 매핑 + 전역 user_id 발급
+# users.id 는 이 테이블의 id 를 그대로 사용하고, 샤드는 user_id 로 결정된다
+class UserDirectory(DirectoryBase):
+    __tablename__ = "user_directory"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    email: Mapped[str] = mapped_column(String(320), unique=True, index=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # 로그인 bloom filter 증분 갱신 기준(생성/이메일 변경 시 DB 시각으로 갱신)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True, nullable=False)
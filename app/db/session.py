@@ -1,6 +1,10 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.shard import ShardRouter, make_engine
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
+# DATABASE_URL: 전역 디렉터리(email -> user_id, user_id 발급)
+engine = make_engine(settings.database_url)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# users / refresh_tokens 는 user_id 기준으로 샤드에 분산
+router = ShardRouter(settings.shard_urls, vnodes=settings.shard_virtual_nodes)
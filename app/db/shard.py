@@ -0,0 +1,77 @@
+from bisect import bisect
+import hashlib
+from typing import Dict, List, Mapping, Sequence, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+# user_id 기준 수평 샤딩 라우터
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+def make_engine(url: str) -> Engine:
+    # 로컬 테스트용 SQLite 파일은 FastAPI 스레드풀에서 공유되므로 스레드 체크 해제
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+
+
+class HashRing:
+    """
+    Consistent hashing ring. 샤드마다 가상 노드를 여러 개 배치해서
+    샤드가 추가/제거될 때 일부 키만 이동하도록 한다.
+    가상 노드 위치는 샤드 이름으로 정해지므로 목록 순서와 무관하다.
+    """
+
+    def __init__(self, shard_ids: Sequence[str], vnodes: int = 64):
+        if not shard_ids:
+            raise ValueError("at least one shard is required")
+        points = sorted(
+            (_hash(f"{shard}#{i}"), shard)
+            for shard in shard_ids
+            for i in range(vnodes)
+        )
+        self._keys: List[int] = [p for p, _ in points]
+        self._shards: List[str] = [s for _, s in points]
+
+    def get(self, key: str) -> str:
+        idx = bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._shards[idx]
+
+
+class ShardRouter:
+    def __init__(self, shards: Mapping[str, str], vnodes: int = 64):
+        # shards: 샤드 이름 -> URL. 같은 URL은 엔진 하나를 공유
+        by_url: Dict[str, Engine] = {}
+        self.engines: Dict[str, Engine] = {}
+        for shard_id, url in shards.items():
+            if url not in by_url:
+                by_url[url] = make_engine(url)
+            self.engines[shard_id] = by_url[url]
+
+        self._sessionmakers = {
+            shard_id: sessionmaker(bind=e, autoflush=False, autocommit=False)
+            for shard_id, e in self.engines.items()
+        }
+        self._ring = HashRing(list(self.engines), vnodes)
+
+    @property
+    def shard_ids(self) -> List[str]:
+        return list(self.engines)
+
+    def has_shard(self, shard_id: object) -> bool:
+        return isinstance(shard_id, str) and shard_id in self.engines
+
+    def shard_for(self, user_id: Union[int, str]) -> str:
+        return self._ring.get(str(int(user_id)))
+
+    def session_for_shard(self, shard_id: str) -> Session:
+        if not self.has_shard(shard_id):
+            raise ValueError(f"Unknown shard: {shard_id}")
+        return self._sessionmakers[shard_id]()
+
+    def session_for(self, user_id: Union[int, str]) -> Session:
+        return self.session_for_shard(self.shard_for(user_id))
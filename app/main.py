@@ -1,10 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.core.config import settings
 from app.routers.auth import router as auth_router
 from app.routers.admin import router as admin_router
 from app.routers.users import router as users_router
+from app.services.login_lookup import login_lookup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 로그인 이메일 bloom filter 최초 로드 + 백그라운드 갱신
+    login_lookup.start()
+    try:
+        yield
+    finally:
+        login_lookup.stop()
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.include_router(auth_router)
 app.include_router(admin_router)
@@ -12,4 +24,4 @@ app.include_router(users_router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok", "env": settings.env}
\ No newline at end of file
+    return {"status": "ok", "env": settings.env}
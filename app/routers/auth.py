@@ -1,24 +1,32 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 import secrets
-from typing import Optional
+import time
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Response, Request, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from jose import JWTError
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db
 from app.core.config import settings
 from app.core.security import (
     verify_password, 
+    verify_password_dummy,
     create_access_token,
     create_refresh_token,
     decode_token,
+    get_unverified_claims,
     refresh_cookie_params,
-    hash_refresh_token
+    hash_refresh_token,
+    user_id_from_sub,
 )
 from app.db.models import User, RefreshToken
+from app.db.session import SessionLocal, router as shard_router
 from app.core.auth_deps import get_current_user
+from app.services.auth_service import find_user_id_by_email
+from app.services.login_lookup import login_lookup
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -39,29 +47,92 @@ def _revoke_family(db: Session, family_id: str) -> None:
     )
     db.commit()
 
+# refresh token 이 저장됐을 수 있는 샤드: shd 힌트(샤드 이름) 우선, 그 다음 sub 로 라우팅한 샤드
+# (재분배로 유저가 옮겨진 경우 힌트가 옛 샤드를 가리킬 수 있다 -> 최대 2곳만 조회, scatter-gather 없음)
+def _refresh_shards(claims: dict) -> List[str]:
+    shards: List[str] = []
+    shd = claims.get("shd")
+    if shard_router.has_shard(shd):
+        shards.append(shd)
+    user_id = user_id_from_sub(claims.get("sub"))
+    if user_id is not None:
+        routed = shard_router.shard_for(user_id)
+        if routed not in shards:
+            shards.append(routed)
+    return shards
+
+# token_hash 로 refresh token 조회. 찾으면 해당 샤드 세션을 열린 채로 반환 (호출자가 close)
+def _find_refresh_token(claims: dict, token_hash: str) -> Tuple[Optional[Session], Optional[RefreshToken], Optional[str]]:
+    for shard_id in _refresh_shards(claims):
+        db = shard_router.session_for_shard(shard_id)
+        rt = db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+        if rt:
+            return db, rt, shard_id
+        db.close()
+    return None, None, None
+
+
+# 자격 증명 확인 + 토큰 발급 (bcrypt / DB 는 블로킹 -> 스레드풀에서 실행). 실패 시 None
+def _authenticate(email: str, password: str) -> Optional[Tuple[str, str]]:
+    # 모르는 이메일: DB 조회 없이, 실제 계정과 같은 bcrypt 비용을 치르고 거절
+    if not login_lookup.might_exist(email):
+        verify_password_dummy(password)
+        return None
+
+    # 전역 디렉터리에서 email -> user_id, 이후 해당 샤드에서 유저 조회
+    directory = SessionLocal()
+    try:
+        user_id = find_user_id_by_email(directory, email)
+    finally:
+        directory.close()
+    if user_id is None:
+        # bloom filter 오탐
+        verify_password_dummy(password)
+        return None
+
+    shard_id = shard_router.shard_for(user_id)
+    db = shard_router.session_for_shard(shard_id)
+    try:
+        user: Optional[User] = db.get(User, user_id)
+        if not user:
+            verify_password_dummy(password)
+            return None
+        if not verify_password(password, user.password_hash):
+            return None
+
+        access = create_access_token(subject=str(user.id), extra_claims={"role": user.role})
+        refresh = create_refresh_token(subject=str(user.id), shard_id=shard_id)
+
+        # DB 저장(원문 저장 금지 -> 해시화)
+        family_id = secrets.token_hex(32)
+        rt = RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(refresh),
+            family_id=family_id,
+            revoked=False,
+            expires_at=_utcnow() + timedelta(days=settings.refresh_token_expires_days),
+        )
+        db.add(rt)
+        db.commit()
+    finally:
+        db.close()
+    return access, refresh
+
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    
-    user: Optional[User] = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, response: Response):
+    started = time.monotonic()
+    tokens = await run_in_threadpool(_authenticate, payload.email, payload.password)
+
+    if tokens is None:
+        # 로그인 실패는 경로(모르는 이메일 / 비밀번호 불일치)와 무관하게 최소 login_failure_min_sec 를 채운 뒤 401
+        # (모르는 이메일은 DB 왕복이 없어 더 빨리 끝난다). 이벤트 루프에서 대기하므로 스레드풀 워커를 잡지 않는다
+        remaining = settings.login_failure_min_sec - (time.monotonic() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    
-    access = create_access_token(subject=str(user.id), extra_claims={"role": user.role})
-    refresh = create_refresh_token(subject=str(user.id))
-
-    # DB 저장(원문 저장 금지 -> 해시화)
-    family_id = secrets.token_hex(32)
-    rt = RefreshToken(
-        user_id=user.id,
-        token_hash=hash_refresh_token(refresh),
-        family_id=family_id,
-        revoked=False,
-        expires_at=_utcnow() + timedelta(days=settings.refresh_token_expires_days),
-    )
-    db.add(rt)
-    db.commit()
 
+    access, refresh = tokens
     response.set_cookie(
         key="refresh_token",
         value=refresh,
@@ -71,7 +142,7 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh(request: Request, response: Response, db: Session = Depends(get_db)):
+def refresh(request: Request, response: Response):
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing refresh token")
@@ -87,22 +158,33 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
         response.delete_cookie(key="refresh_token", path="/")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
 
-    user_id = claims.get("sub")
-    if not user_id:
+    user_id = user_id_from_sub(claims.get("sub"))
+    if user_id is None:
         response.delete_cookie(key="refresh_token", path="/")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
     # 2) DB에서 “해시”로 존재/폐기 여부 확인
-    token_hash = hash_refresh_token(refresh_token)
-    rt: Optional[RefreshToken] = (
-        db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
-    )
+    db, rt, shard_id = _find_refresh_token(claims, hash_refresh_token(refresh_token))
 
     # DB에 없으면: 탈취/비정상 케이스로 보고 쿠키 제거 후 401
     if not rt:
         response.delete_cookie(key="refresh_token", path="/")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
+    try:
+        new_access, new_refresh = _rotate_refresh(db, shard_id, rt, user_id, response)
+    finally:
+        db.close()
+
+    response.set_cookie(
+        key="refresh_token",
+        value=new_refresh,
+        **refresh_cookie_params(),
+    )
+    return TokenResponse(access_token=new_access)
+
+
+def _rotate_refresh(db: Session, shard_id: str, rt: RefreshToken, user_id: int, response: Response) -> Tuple[str, str]:
     # 재사용 탐지: 이미 revoked 된 토큰을 들고 오면 family 전체 폐기
     if rt.revoked:
         _revoke_family(db, rt.family_id)
@@ -116,16 +198,16 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
         response.delete_cookie(key="refresh_token", path="/")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
 
-    # 3) Rotation: 기존 refresh 폐기 + 새 refresh 발급/저장
+    # 3) Rotation: 기존 refresh 폐기 + 새 refresh 발급/저장 (family 는 같은 샤드에 유지)
     rt.revoked = True
     rt.last_used_at = _utcnow()
     db.commit()
 
     new_access = create_access_token(subject=str(user_id))
-    new_refresh = create_refresh_token(subject=str(user_id))
+    new_refresh = create_refresh_token(subject=str(user_id), shard_id=shard_id)
 
     new_rt = RefreshToken(
-        user_id=int(user_id),
+        user_id=user_id,
         token_hash=hash_refresh_token(new_refresh),
         family_id=rt.family_id,  # 같은 세션 체인 유지
         revoked=False,
@@ -133,24 +215,27 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
     )
     db.add(new_rt)
     db.commit()
-
-    response.set_cookie(
-        key="refresh_token",
-        value=new_refresh,
-        **refresh_cookie_params(),
-    )
-    return TokenResponse(access_token=new_access)
+    return new_access, new_refresh
 
 
 @router.post("/logout", status_code=204)
-def logout(request: Request, response: Response, db: Session = Depends(get_db)):
+def logout(request: Request, response: Response):
     refresh_token = request.cookies.get("refresh_token")
     if refresh_token:
-        token_hash = hash_refresh_token(refresh_token)
-        rt = db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
-        if rt and not rt.revoked:
-            rt.revoked = True
-            db.commit()
+        # 만료된 토큰도 폐기할 수 있도록 서명 검증 없이 샤드만 결정 (조회는 해시로)
+        try:
+            claims = get_unverified_claims(refresh_token)
+        except JWTError:
+            claims = {}
+
+        db, rt, _ = _find_refresh_token(claims, hash_refresh_token(refresh_token))
+        if db is not None:
+            try:
+                if not rt.revoked:
+                    rt.revoked = True
+                    db.commit()
+            finally:
+                db.close()
 
     response.delete_cookie(key="refresh_token", path="/")
     return Response(status_code=204)
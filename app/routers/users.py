@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
-from app.core.deps import get_db
+from app.core.deps import get_directory_db, get_user_db
 from app.core.authz_deps import require_owner_or_admin, require_roles
-from app.db.models import User
-from app.routers.auth_service import revoke_all_refresh_token
+from app.db.models import User, UserDirectory
+from app.services.auth_service import revoke_all_refresh_tokens
+from app.services.login_lookup import login_lookup
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -17,7 +19,7 @@ class RoleUpdateRequest(BaseModel):
     role: str
 
 @router.get("/{user_id}")
-def get_user(user_id: int, _: User = Depends(require_owner_or_admin), db: Session = Depends(get_db)):
+def get_user(user_id: int, _: User = Depends(require_owner_or_admin), db: Session = Depends(get_user_db)):
     u = db.get(User, user_id)
     if not u:
         return {"detail": "Not found"}
@@ -25,17 +27,40 @@ def get_user(user_id: int, _: User = Depends(require_owner_or_admin), db: Sessio
 
 # 본인 프로필 수정 API
 @router.patch("/{user_id}")
-def update_user(user_id: int, payload: UserUpdateRequest, _: User = Depends(require_owner_or_admin), db: Session = Depends(get_db)):
+def update_user(user_id: int, payload: UserUpdateRequest, _: User = Depends(require_owner_or_admin), db: Session = Depends(get_user_db), directory: Session = Depends(get_directory_db)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
     if payload.email is not None:
-        # 중복 이메일 방지
-        exists = db.query(User).filter(User.email == payload.email, User.id != user_id).first()
+        # 중복 이메일 방지 (샤드 간 유일성은 전역 디렉터리 기준)
+        exists = directory.query(UserDirectory).filter(UserDirectory.email == payload.email, UserDirectory.id != user_id).first()
         if exists:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already in use")
+
+        # 샤드 row 먼저 commit -> 디렉터리 반영 실패 시 샤드를 원래 이메일로 되돌린다
+        old_email = u.email
         u.email = payload.email
+        db.commit()
+        try:
+            entry = directory.get(UserDirectory, user_id)
+            if entry:
+                entry.email = payload.email
+            else:
+                directory.add(UserDirectory(id=user_id, email=payload.email))
+            directory.commit()
+        except IntegrityError:
+            # 중복 검사 이후 다른 요청이 같은 이메일을 선점한 경우
+            directory.rollback()
+            u.email = old_email
+            db.commit()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already in use")
+        except Exception:
+            directory.rollback()
+            u.email = old_email
+            db.commit()
+            raise
+        login_lookup.add(payload.email)
 
     db.commit()
     db.refresh(u)
@@ -43,7 +68,7 @@ def update_user(user_id: int, payload: UserUpdateRequest, _: User = Depends(requ
 
 # 관리자 전용: 권한 변경 API
 @router.patch("/{user_id}/role")
-def update_role(user_id: int, payload: RoleUpdateRequest, _: User = Depends(require_roles(["admin"])), db: Session = Depends(get_db)):
+def update_role(user_id: int, payload: RoleUpdateRequest, _: User = Depends(require_roles(["admin"])), db: Session = Depends(get_user_db)):
     if payload.role not in ("user", "admin"):
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Invalid role")
     
@@ -58,7 +83,7 @@ def update_role(user_id: int, payload: RoleUpdateRequest, _: User = Depends(requ
 
 # 관지라 전용: 계정 비활성화 + 세션 강제종료 API
 @router.patch("/{user_id}/disable")
-def disable_user(user_id: int, _: User = Depends(require_roles(["admin"])), db: Session = Depends(get_db)):
+def disable_user(user_id: int, _: User = Depends(require_roles(["admin"])), db: Session = Depends(get_user_db)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -66,16 +91,19 @@ def disable_user(user_id: int, _: User = Depends(require_roles(["admin"])), db:
     u.is_active = False
     db.commit()
 
-    revoke_all_refresh_token(db, user_id)
+    revoke_all_refresh_tokens(user_id)
     return {"id": u.id, "email": u.email, "role": u.role, "is_active": u.is_active}
 
 # 관리자 전용: 유저 삭제
 @router.delete("/{user_id}", status_code=204)
-def delete_user(user_id: int, _: User = Depends(require_roles(["admin"])), db: Session = Depends(get_db)):
+def delete_user(user_id: int, _: User = Depends(require_roles(["admin"])), db: Session = Depends(get_user_db), directory: Session = Depends(get_directory_db)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
     db.delete(u)
     db.commit()
+
+    directory.query(UserDirectory).filter(UserDirectory.id == user_id).delete(synchronize_session=False)
+    directory.commit()
     return
\ No newline at end of file
@@ -1,11 +1,67 @@
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.db.models import RefreshToken
+from app.core.security import hash_password
+from app.db.models import RefreshToken, User, UserDirectory
+from app.db.session import SessionLocal, router
+from app.services.login_lookup import login_lookup
 
 # 세션 강제 종료 유틸
-# 특정 유저의 refresh 토큰 전부 폐기
-def revoke_all_refresh_tokens(db: Session, user_id: int) -> None:
-    db.query(RefreshToken).filter(RefreshToken.user_id == user_id).update(
-        {"revoked": True}, synchronize_session=False
-    )
-    db.commit()
\ No newline at end of file
+# 특정 유저의 refresh 토큰 전부 폐기 (user_id 가 속한 샤드에서)
+def revoke_all_refresh_tokens(user_id: int) -> None:
+    db = router.session_for(user_id)
+    try:
+        db.query(RefreshToken).filter(RefreshToken.user_id == user_id).update(
+            {"revoked": True}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+# 디렉터리에서 email -> user_id 조회
+def find_user_id_by_email(directory: Session, email: str) -> Optional[int]:
+    entry = directory.query(UserDirectory).filter(UserDirectory.email == email).first()
+    return entry.id if entry else None
+
+# 유저 생성: 디렉터리에서 전역 user_id 를 발급받고, 해당 샤드에 users row 생성
+# 이메일 중복이면 None
+def provision_user(email: str, password: str, role: str = "user") -> Optional[User]:
+    directory = SessionLocal()
+    try:
+        entry = UserDirectory(email=email)
+        directory.add(entry)
+        try:
+            directory.commit()
+        except IntegrityError:
+            directory.rollback()
+            return None
+        user_id = entry.id
+    finally:
+        directory.close()
+    login_lookup.add(email)
+
+    db = router.session_for(user_id)
+    try:
+        u = User(id=user_id, email=email, password_hash=hash_password(password), role=role)
+        db.add(u)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            # 샤드 쓰기 실패 시 디렉터리 예약 해제
+            _release_directory_entry(user_id)
+            raise
+        db.refresh(u)
+        return u
+    finally:
+        db.close()
+
+def _release_directory_entry(user_id: int) -> None:
+    directory = SessionLocal()
+    try:
+        directory.query(UserDirectory).filter(UserDirectory.id == user_id).delete(synchronize_session=False)
+        directory.commit()
+    finally:
+        directory.close()
@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import UserDirectory
+from app.db.session import SessionLocal
+
+# 로그인 조회 레이어: 존재하지 않는 이메일은 DB 조회 없이 거른다 (credential stuffing 방어)
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(email: str) -> str:
+    # MySQL 기본 collation 은 대소문자 무시 -> 필터도 동일하게 취급해야 false negative 가 없다
+    return email.strip().lower()
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        # double hashing: h1 + i * h2
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class LoginLookup:
+    """
+    user_directory 의 이메일을 담은 bloom filter.
+    - 음성(없음)이면 확실히 없는 이메일 -> DB 조회 생략
+    - 양성이면 DB 조회 (false positive 는 error_rate 수준)
+    - 아직 로드 전이면 항상 양성(DB 조회)으로 취급해 false negative 를 만들지 않는다
+
+    갱신은 요청 스레드가 아니라 백그라운드 스레드에서 한다.
+    같은 프로세스의 가입/이메일 변경은 add() 로 즉시 반영된다.
+    다른 워커에서 생긴 가입/이메일 변경은 updated_at 기준 증분 갱신(overlap 만큼 겹쳐 읽기)으로 반영되며,
+    그 전까지(최대 refresh_sec + 갱신 쿼리 시간) 이 워커에서는 해당 이메일 로그인이 거절될 수 있다.
+    삭제된 이메일(오탐만 유발)은 주기적인 전체 재구성으로 정리한다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        capacity: int,
+        error_rate: float,
+        refresh_sec: float,
+        rebuild_sec: float,
+        overlap_sec: float,
+    ):
+        self._session_factory = session_factory
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._refresh_sec = refresh_sec
+        self._rebuild_sec = rebuild_sec
+        self._overlap = timedelta(seconds=overlap_sec)
+        self._lock = threading.Lock()
+
+        self._filter = BloomFilter(capacity, error_rate)
+        self._filter_capacity = capacity
+        self._count = 0
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._rebuilt_at = 0.0
+        # 재구성 중에 add() 된 이메일 (새 필터로 교체할 때 다시 넣는다)
+        self._pending: List[str] = []
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def might_exist(self, email: str) -> bool:
+        # 요청 경로에서는 비트 배열만 확인 (DB / 락 없음)
+        if not self._loaded:
+            return True
+        return _normalize(email) in self._filter
+
+    def add(self, email: str) -> None:
+        # update_user / provisioning 에서 즉시 반영
+        key = _normalize(email)
+        with self._lock:
+            self._filter.add(key)
+            self._pending.append(key)
+            self._count += 1
+
+    def refresh(self) -> None:
+        # 마지막으로 본 updated_at - overlap 이후 생성/변경된 이메일만 읽는다
+        # (id 는 commit 순서와 다를 수 있고, 이메일 변경은 id 가 그대로라 id 기준으로는 놓친다)
+        db = self._session_factory()
+        try:
+            q = db.query(UserDirectory.email, UserDirectory.updated_at)
+            if self._watermark is not None:
+                q = q.filter(UserDirectory.updated_at >= self._watermark - self._overlap)
+            rows = q.all()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._ingest(self._filter, rows)
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._pending = []
+
+        db = self._session_factory()
+        try:
+            capacity = max(self._capacity, db.query(UserDirectory).count() * 2)
+            rows = db.query(UserDirectory.email, UserDirectory.updated_at).all()
+        finally:
+            db.close()
+
+        bf = BloomFilter(capacity, self._error_rate)
+        with self._lock:
+            self._count = 0
+            self._watermark = None
+            self._ingest(bf, rows)
+            for key in self._pending:
+                bf.add(key)
+            self._pending = []
+            self._filter = bf
+            self._filter_capacity = capacity
+            self._loaded = True
+            self._rebuilt_at = time.monotonic()
+
+    def _ingest(self, bf: BloomFilter, rows: Iterable) -> None:
+        for email, updated_at in rows:
+            key = _normalize(email)
+            if key not in bf:
+                bf.add(key)
+                self._count += 1
+            if self._watermark is None or updated_at > self._watermark:
+                self._watermark = updated_at
+
+    def sync(self) -> None:
+        # 최초 로드 / 주기적 재구성 / 용량 초과(오탐률 상승) 시 재구성, 그 외에는 증분 갱신
+        if (
+            not self._loaded
+            or time.monotonic() - self._rebuilt_at >= self._rebuild_sec
+            or self._count > self._filter_capacity
+        ):
+            self.rebuild()
+        else:
+            self.refresh()
+
+    def start(self) -> None:
+        # 앱 시작 시 한 번 동기 로드 후 백그라운드 갱신 시작
+        # 디렉터리 DB 장애로 로드에 실패해도 앱은 뜬다 (미로드 상태 = 전부 DB 조회) -> 백그라운드에서 재시도
+        if self._thread is not None:
+            return
+        try:
+            self.sync()
+        except Exception:
+            logger.exception("login lookup initial load failed; retrying in background")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="login-lookup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._refresh_sec):
+            try:
+                self.sync()
+            except Exception:
+                # DB 장애 시에도 기존 필터는 유지하고 다음 주기에 재시도
+                logger.exception("login lookup sync failed")
+
+
+login_lookup = LoginLookup(
+    SessionLocal,
+    capacity=settings.login_filter_capacity,
+    error_rate=settings.login_filter_error_rate,
+    refresh_sec=settings.login_filter_refresh_sec,
+    rebuild_sec=settings.login_filter_rebuild_sec,
+    overlap_sec=settings.login_filter_overlap_sec,
+)
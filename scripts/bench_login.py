@@ -0,0 +1,138 @@
+"""
+로그인 credential stuffing 벤치마크: 99% 존재하지 않는 이메일 + 1% 실제 계정
+
+버킷
+- unknown       : 존재하지 않는 이메일
+- wrong-password: 존재하는 이메일 + 틀린 비밀번호 (unknown 과 시간이 같아야 계정 존재 여부가 새지 않는다)
+- valid         : 정상 로그인 (refresh token INSERT 포함, 참고용)
+
+모드
+- naive : bloom filter 우회 (모든 시도가 디렉터리 email 인덱스를 조회)
+- filter: login_lookup 사용 (모르는 이메일은 DB 조회 0회)
+
+실패 응답 최소 시간 패딩(LOGIN_FAILURE_MIN_SEC)은 기본으로 끄고 측정한다 (--failure-min-sec 로 지정).
+패딩을 켜면 실패 버킷이 전부 그 값으로 맞춰져 필터/DB 비용이 보이지 않는다.
+
+기본은 항상 임시 SQLite 디렉터리/샤드 파일을 사용한다.
+현재 환경변수의 DB 에 벤치 유저를 만들려면 --use-env 를 명시할 것 (만든 유저는 지우지 않는다).
+python -m scripts.bench_login --attempts 300
+"""
+import argparse
+import asyncio
+import os
+import random
+import secrets
+import statistics
+import tempfile
+import time
+
+PASSWORD = "bench-password"
+BUCKETS = ("unknown", "wrong-password", "valid")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+def _attempt(email: str, password: str) -> bool:
+    from fastapi import HTTPException, Response
+
+    from app.routers.auth import LoginRequest, login
+
+    try:
+        asyncio.run(login(LoginRequest(email=email, password=password), Response()))
+        return True
+    except HTTPException:
+        return False
+
+
+def _run(label: str, attempts, counter: QueryCounter) -> None:
+    timings = {b: [] for b in BUCKETS}
+    queries = {b: 0 for b in BUCKETS}
+    for email, password, bucket in attempts:
+        before = counter.count
+        start = time.perf_counter()
+        ok = _attempt(email, password)
+        timings[bucket].append((time.perf_counter() - start) * 1000)
+        queries[bucket] += counter.count - before
+        assert ok == (bucket == "valid"), email
+
+    print(f"[{label}]")
+    for bucket in BUCKETS:
+        t = timings[bucket]
+        if not t:
+            continue
+        print(
+            f"  {bucket:<14} n={len(t):<5} mean={statistics.mean(t):7.2f}ms "
+            f"stdev={statistics.pstdev(t):6.2f}ms queries/attempt={queries[bucket] / len(t):.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--attempts", type=int, default=200)
+    parser.add_argument("--valid-ratio", type=float, default=0.01)
+    parser.add_argument("--failure-min-sec", type=float, default=0.0)
+    parser.add_argument("--use-env", action="store_true", help="임시 SQLite 대신 현재 DATABASE_URL / SHARD_DATABASE_URLS 사용")
+    args = parser.parse_args()
+
+    # app 설정은 import 시점에 읽히므로 import 전에 DB / 패딩을 고정
+    os.environ["LOGIN_FAILURE_MIN_SEC"] = str(args.failure_min_sec)
+    if not args.use_env:
+        tmp = tempfile.mkdtemp(prefix="jwt-toy-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/directory.db"
+        os.environ["SHARD_DATABASE_URLS"] = ",".join(
+            f"s{i}=sqlite:///{tmp}/shard{i}.db" for i in range(3)
+        )
+        os.environ.setdefault("JWT_SECRET_KEY", secrets.token_urlsafe(32))
+        print("using temp SQLite:", tmp)
+
+    from sqlalchemy import event
+
+    from app.db.session import engine, router
+    from app.services.auth_service import provision_user
+    from app.services.login_lookup import login_lookup
+    from scripts.init_shards import main as init_shards
+
+    if not args.use_env:
+        init_shards()
+
+    emails = [f"bench-{i}-{secrets.token_hex(4)}@example.com" for i in range(args.users)]
+    for email in emails:
+        provision_user(email, PASSWORD)
+
+    # 실제 계정 비율(valid-ratio)을 정상 로그인 / 틀린 비밀번호로 반씩 나눈다
+    rng = random.Random(0)
+    attempts = []
+    for _ in range(args.attempts):
+        if rng.random() < args.valid_ratio:
+            if rng.random() < 0.5:
+                attempts.append((rng.choice(emails), PASSWORD, "valid"))
+            else:
+                attempts.append((rng.choice(emails), "wrong-" + PASSWORD, "wrong-password"))
+        else:
+            attempts.append((f"nobody-{secrets.token_hex(6)}@example.com", PASSWORD, "unknown"))
+    # 각 버킷이 최소 1회는 섞이도록
+    attempts[0] = (emails[0], PASSWORD, "valid")
+    attempts[1] = (emails[1 % len(emails)], "wrong-" + PASSWORD, "wrong-password")
+
+    counter = QueryCounter()
+    for e in dict.fromkeys([engine, *router.engines.values()]):
+        event.listen(e, "before_cursor_execute", counter)
+
+    login_lookup.rebuild()
+    might_exist = login_lookup.might_exist
+    login_lookup.might_exist = lambda email: True
+    _run("naive", attempts, counter)
+
+    login_lookup.might_exist = might_exist
+    _run("filter", attempts, counter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+로컬 샤딩 테스트용: 디렉터리 DB 에 user_directory, 각 샤드에 users / refresh_tokens 생성 (alembic 없이)
+
+DATABASE_URL=sqlite:///./directory.db \
+SHARD_DATABASE_URLS=s0=sqlite:///./shard0.db,s1=sqlite:///./shard1.db,s2=sqlite:///./shard2.db \
+python -m scripts.init_shards
+"""
+from app.db.base import Base, DirectoryBase
+from app.db import models  # noqa: F401
+from app.db.session import engine, router
+
+def main():
+    DirectoryBase.metadata.create_all(bind=engine)
+    print("initialized directory:", engine.url)
+    for shard_id, e in router.engines.items():
+        Base.metadata.create_all(bind=e)
+        print(f"initialized shard {shard_id}:", e.url)
+
+if __name__ == "__main__":
+    main()
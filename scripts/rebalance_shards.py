@@ -0,0 +1,114 @@
+"""
+users / refresh_tokens row 를 router.shard_for(user_id) 가 가리키는 샤드로 옮긴다.
+
+- 단일 DB -> 샤딩 전환: 기존 DATABASE_URL 의 users / refresh_tokens 를 각 샤드로 이동
+- 샤드 추가 후: consistent hashing 으로 담당이 바뀐 유저만 새 샤드로 이동
+
+유저 단위로 대상 샤드에 먼저 복사(commit) 후 원본에서 삭제하므로, 중간에 끊겨도 다시 실행하면 된다.
+실행 전에 alembic upgrade head 로 모든 샤드에 테이블을 만들어 둘 것.
+
+python -m scripts.rebalance_shards [--dry-run] [--batch-size 500]
+"""
+import argparse
+from typing import Dict, List, Optional
+
+from sqlalchemy import MetaData, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.db.session import engine as directory_engine, router
+
+
+def _table(name: str, e: Engine) -> Optional[Table]:
+    if not inspect(e).has_table(name):
+        return None
+    return Table(name, MetaData(), autoload_with=e)
+
+
+def _copy_rows(dst: Connection, src_table: Table, dst_table: Table, rows: List[dict], key: str, skip: tuple = ()) -> None:
+    # 대상에 이미 있는 row(이전 실행에서 복사됨)는 건너뛴다
+    columns = [c.name for c in dst_table.columns if c.name in src_table.columns and c.name not in skip]
+    keys = [r[key] for r in rows]
+    existing = set(dst.execute(select(dst_table.c[key]).where(dst_table.c[key].in_(keys))).scalars())
+    payload = [{c: r[c] for c in columns} for r in rows if r[key] not in existing]
+    if payload:
+        dst.execute(dst_table.insert(), payload)
+
+
+def rebalance(dry_run: bool = False, batch_size: int = 500) -> Dict[str, int]:
+    # URL 단위로 원본 후보 수집 (디렉터리 DB 의 기존 users 테이블 포함)
+    engines: Dict[str, Engine] = {settings.database_url: directory_engine}
+    shard_urls = settings.shard_urls
+    for shard_id, e in router.engines.items():
+        engines.setdefault(shard_urls[shard_id], e)
+
+    # 대상 샤드 테이블 reflection 캐시
+    dst_tables = {
+        shard_id: (_table("users", e), _table("refresh_tokens", e)) for shard_id, e in router.engines.items()
+    }
+
+    moved: Dict[str, int] = {}
+    for src_url, src_engine in engines.items():
+        src_users = _table("users", src_engine)
+        src_tokens = _table("refresh_tokens", src_engine)
+        if src_users is None:
+            continue
+
+        last_id = 0
+        while True:
+            with src_engine.connect() as src:
+                users = [
+                    dict(r) for r in src.execute(
+                        select(src_users).where(src_users.c.id > last_id).order_by(src_users.c.id).limit(batch_size)
+                    ).mappings()
+                ]
+            if not users:
+                break
+            last_id = users[-1]["id"]
+
+            for u in users:
+                target = router.shard_for(u["id"])
+                if shard_urls[target] == src_url:
+                    continue
+                moved[target] = moved.get(target, 0) + 1
+                if dry_run:
+                    continue
+
+                dst_users, dst_tokens = dst_tables[target]
+                if dst_users is None or dst_tokens is None:
+                    raise RuntimeError(f"shard {target} has no users/refresh_tokens tables; run alembic upgrade head first")
+                with src_engine.connect() as src, router.engines[target].begin() as dst:
+                    tokens = []
+                    if src_tokens is not None:
+                        tokens = [
+                            dict(r) for r in src.execute(
+                                select(src_tokens).where(src_tokens.c.user_id == u["id"])
+                            ).mappings()
+                        ]
+                    _copy_rows(dst, src_users, dst_users, [u], "id")
+                    if tokens:
+                        # refresh_tokens.id 는 샤드마다 따로 증가 -> 대상에서 새로 발급
+                        _copy_rows(dst, src_tokens, dst_tokens, tokens, "token_hash", skip=("id",))
+                # 대상 commit 이후 원본 삭제
+                with src_engine.begin() as src:
+                    if src_tokens is not None:
+                        src.execute(src_tokens.delete().where(src_tokens.c.user_id == u["id"]))
+                    src.execute(src_users.delete().where(src_users.c.id == u["id"]))
+
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    moved = rebalance(dry_run=args.dry_run, batch_size=args.batch_size)
+    verb = "would move" if args.dry_run else "moved"
+    for shard_id in router.shard_ids:
+        print(f"{verb} to {shard_id}: {moved.get(shard_id, 0)} users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+import tempfile
+
+import pytest
+
+# app.core.config 가 import 시점에 환경변수를 읽으므로 app import 전에 임시 SQLite 로 고정
+_tmp = tempfile.mkdtemp(prefix="jwt-toy-test-")
+os.environ["ENV"] = "dev"
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-jwt-toy-tests-0123456789"
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/directory.db"
+# 백그라운드 증분 갱신이 테스트 중에 끼어들지 않도록 (add() 즉시 반영 여부를 검증하기 위해)
+os.environ["LOGIN_FILTER_REFRESH_SEC"] = "3600"
+os.environ["SHARD_DATABASE_URLS"] = ",".join(
+    f"s{i}=sqlite:///{_tmp}/shard{i}.db" for i in range(3)
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    from scripts.init_shards import main as init_shards
+
+    init_shards()
+    yield
@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.models import UserDirectory
+from app.db.session import SessionLocal, engine, router
+from app.main import app
+from app.services.auth_service import provision_user
+from app.services.login_lookup import LoginLookup, login_lookup
+
+PASSWORD = "pw-1234"
+
+
+def _email() -> str:
+    return f"lookup-{uuid.uuid4().hex[:12]}@example.com"
+
+
+def _lookup() -> LoginLookup:
+    return LoginLookup(SessionLocal, capacity=1000, error_rate=0.001, refresh_sec=60, rebuild_sec=3600, overlap_sec=30)
+
+
+def _insert(email: str, user_id: int = None) -> UserDirectory:
+    with SessionLocal() as db:
+        entry = UserDirectory(id=user_id, email=email)
+        db.add(entry)
+        db.commit()
+        db.refresh(entry)
+        return entry
+
+
+@contextmanager
+def _count_queries():
+    counter = {"n": 0}
+
+    def _listener(*args, **kwargs):
+        counter["n"] += 1
+
+    engines = list(dict.fromkeys([engine, *router.engines.values()]))
+    for e in engines:
+        event.listen(e, "before_cursor_execute", _listener)
+    try:
+        yield counter
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", _listener)
+
+
+def _login(client: TestClient, email: str, password: str = PASSWORD):
+    return client.post("/auth/login", json={"email": email, "password": password})
+
+
+def test_unloaded_filter_never_rejects():
+    assert _lookup().might_exist(_email())
+
+
+def test_refresh_picks_up_email_changed_by_another_worker():
+    lookup = _lookup()
+    entry = _insert(_email())
+    lookup.sync()
+
+    # 다른 워커의 update_user: 이 프로세스의 add() 는 호출되지 않고 id 도 그대로
+    new_email = _email()
+    with SessionLocal() as db:
+        db.get(UserDirectory, entry.id).email = new_email
+        db.commit()
+    assert not lookup.might_exist(new_email)
+
+    lookup.refresh()
+    assert lookup.might_exist(new_email)
+
+
+def test_refresh_picks_up_rows_committed_out_of_id_order():
+    lookup = _lookup()
+    base = 5_000_000 + uuid.uuid4().int % 1_000_000
+    later_id, earlier_id = _email(), _email()
+    _insert(later_id, base + 1)
+    lookup.sync()
+
+    # 더 작은 id 가 나중에 commit 되는 경우
+    _insert(earlier_id, base)
+    lookup.refresh()
+    assert lookup.might_exist(later_id)
+    assert lookup.might_exist(earlier_id)
+
+
+def test_login_failures_are_padded_to_minimum_time():
+    user = provision_user(_email(), PASSWORD)
+    client = TestClient(app)
+
+    for email, password in ((_email(), PASSWORD), (user.email, "wrong")):
+        started = time.monotonic()
+        r = client.post("/auth/login", json={"email": email, "password": password})
+        assert r.status_code == 401
+        assert time.monotonic() - started >= settings.login_failure_min_sec
+
+
+def test_start_survives_directory_outage():
+    def _down():
+        raise RuntimeError("directory unreachable")
+
+    lookup = LoginLookup(_down, capacity=1000, error_rate=0.001, refresh_sec=3600, rebuild_sec=3600, overlap_sec=30)
+    lookup.start()
+    try:
+        # 미로드 상태 -> 전부 DB 조회로 넘긴다
+        assert lookup.might_exist(_email())
+    finally:
+        lookup.stop()
+
+
+def test_unknown_email_login_makes_no_db_queries():
+    with TestClient(app) as client:
+        with _count_queries() as queries:
+            assert _login(client, _email()).status_code == 401
+        assert queries["n"] == 0
+
+        user = provision_user(_email(), PASSWORD)
+        with _count_queries() as queries:
+            assert _login(client, user.email, "wrong").status_code == 401
+        assert queries["n"] > 0
+
+
+def test_provisioned_email_is_visible_immediately():
+    with TestClient(app) as client:
+        # lifespan 로드 이후 생성 -> 증분 갱신 없이 add() 만으로 로그인 가능해야 한다
+        user = provision_user(_email(), PASSWORD)
+        assert login_lookup.might_exist(user.email)
+        assert _login(client, user.email).status_code == 200
+
+
+def test_email_change_via_patch_is_visible_immediately():
+    with TestClient(app) as client:
+        user = provision_user(_email(), PASSWORD)
+        access = _login(client, user.email).json()["access_token"]
+
+        new_email = _email()
+        assert not login_lookup.might_exist(new_email)
+        r = client.patch(
+            f"/users/{user.id}",
+            json={"email": new_email},
+            headers={"Authorization": f"Bearer {access}"},
+        )
+        assert r.status_code == 200
+        assert r.json()["email"] == new_email
+
+        assert _login(client, new_email).status_code == 200
+        assert _login(client, user.email).status_code == 401
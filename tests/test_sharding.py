@@ -0,0 +1,136 @@
+from datetime import datetime
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.db.base import Base
+from app.db.models import RefreshToken, User, UserDirectory
+from app.db.session import SessionLocal, engine, router
+from app.db.shard import HashRing
+from app.main import app
+from app.services.auth_service import provision_user
+
+PASSWORD = "pw-1234"
+
+
+def _email() -> str:
+    return f"user-{uuid.uuid4().hex[:12]}@example.com"
+
+
+def _users_on_distinct_shards(count: int = 2) -> list:
+    users = {}
+    while len(users) < count:
+        u = provision_user(_email(), PASSWORD)
+        users.setdefault(router.shard_for(u.id), u)
+    return list(users.values())
+
+
+def test_shard_for_is_deterministic_and_order_independent():
+    a = HashRing(["s0", "s1", "s2"])
+    b = HashRing(["s2", "s0", "s1"])
+    keys = [str(i) for i in range(2000)]
+    assert [a.get(k) for k in keys] == [b.get(k) for k in keys]
+    assert [router.shard_for(i) for i in range(200)] == [router.shard_for(str(i)) for i in range(200)]
+    assert set(a.get(k) for k in keys) == {"s0", "s1", "s2"}
+
+
+def test_adding_shard_moves_only_some_keys():
+    before = HashRing(["s0", "s1", "s2"])
+    after = HashRing(["s0", "s1", "s2", "s3"])
+    keys = [str(i) for i in range(20000)]
+    moved = [k for k in keys if before.get(k) != after.get(k)]
+
+    # 이상적으로 1/4. 옮겨지는 키는 전부 새 샤드로만 간다
+    assert 0.1 < len(moved) / len(keys) < 0.4
+    assert all(after.get(k) == "s3" for k in moved)
+
+
+def test_login_refresh_logout_across_shards():
+    for user in _users_on_distinct_shards():
+        shard_id = router.shard_for(user.id)
+        client = TestClient(app)
+
+        r = client.post("/auth/login", json={"email": user.email, "password": PASSWORD})
+        assert r.status_code == 200
+        access = r.json()["access_token"]
+        first_refresh = client.cookies["refresh_token"]
+
+        # refresh token 은 유저가 속한 샤드에만 저장
+        for sid in router.shard_ids:
+            with router.session_for_shard(sid) as db:
+                count = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).count()
+            assert count == (1 if sid == shard_id else 0)
+
+        r = client.get("/auth/me", headers={"Authorization": f"Bearer {access}"})
+        assert r.status_code == 200
+        assert r.json() == {"id": user.id, "email": user.email}
+
+        r = client.post("/auth/refresh")
+        assert r.status_code == 200
+        second_refresh = client.cookies["refresh_token"]
+        assert second_refresh != first_refresh
+
+        assert client.post("/auth/logout").status_code == 204
+        with router.session_for_shard(shard_id) as db:
+            tokens = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).all()
+        assert len(tokens) == 2 and all(t.revoked for t in tokens)
+
+        replay = TestClient(app)
+        replay.cookies.set("refresh_token", second_refresh)
+        assert replay.post("/auth/refresh").status_code == 401
+
+
+def test_rebalance_moves_legacy_rows_to_shards():
+    from scripts.rebalance_shards import rebalance
+
+    # 단일 DB 시절처럼 디렉터리 DB 에 users / refresh_tokens 가 남아 있는 상태
+    Base.metadata.create_all(bind=engine)
+    user_ids = []
+    with SessionLocal() as db:
+        for _ in range(6):
+            email = _email()
+            entry = UserDirectory(email=email)
+            db.add(entry)
+            db.flush()
+            db.add(User(id=entry.id, email=email, password_hash="x", role="user"))
+            user_ids.append(entry.id)
+        db.flush()
+        for user_id in user_ids:
+            db.add(RefreshToken(
+                user_id=user_id, token_hash=uuid.uuid4().hex * 2, family_id="f",
+                revoked=False, expires_at=datetime(2099, 1, 1),
+            ))
+        db.commit()
+
+    try:
+        moved = rebalance()
+        assert sum(moved.values()) == len(user_ids)
+
+        with SessionLocal() as db:
+            assert db.execute(select(User.id).where(User.id.in_(user_ids))).first() is None
+        for user_id in user_ids:
+            with router.session_for(user_id) as db:
+                assert db.get(User, user_id) is not None
+                assert db.query(RefreshToken).filter(RefreshToken.user_id == user_id).count() == 1
+
+        # 재실행해도 옮길 것이 없다
+        assert rebalance() == {}
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_non_ascii_digit_sub_is_rejected_not_500():
+    from jose import jwt
+
+    # 서명 없는 위조 쿠키: logout 은 검증 없이 claims 를 읽으므로 sub 검증이 필요하다
+    forged = jwt.encode({"sub": "²", "typ": "refresh"}, "not-the-secret", algorithm="HS256")
+    client = TestClient(app)
+    client.cookies.set("refresh_token", forged)
+    assert client.post("/auth/logout").status_code == 204
+    assert client.post("/auth/refresh").status_code == 401
+
+    from app.core.security import create_access_token
+    token = create_access_token(subject="²")
+    r = TestClient(app).get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 401